@@ -90,10 +90,10 @@ func (x *MovieRequest) GetKeywords() string {
 	return ""
 }
 
-// Response containing the embedding.
+// Response containing the embedding, packed as little-endian float32.
 type EmbeddingResponse struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
-	Embedding     []float32              `protobuf:"fixed32,1,rep,packed,name=embedding,proto3" json:"embedding,omitempty"`
+	Embedding     []byte                 `protobuf:"bytes,1,opt,name=embedding,proto3" json:"embedding,omitempty"`
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
@@ -128,7 +128,7 @@ func (*EmbeddingResponse) Descriptor() ([]byte, []int) {
 	return file_proto_movie_proto_rawDescGZIP(), []int{1}
 }
 
-func (x *EmbeddingResponse) GetEmbedding() []float32 {
+func (x *EmbeddingResponse) GetEmbedding() []byte {
 	if x != nil {
 		return x.Embedding
 	}
@@ -443,7 +443,7 @@ var file_proto_movie_proto_rawDesc = string([]byte{
 	0x72, 0x64, 0x73, 0x18, 0x04, 0x20, 0x01, 0x28, 0x09, 0x52, 0x08, 0x6b, 0x65, 0x79, 0x77, 0x6f,
 	0x72, 0x64, 0x73, 0x22, 0x31, 0x0a, 0x11, 0x45, 0x6d, 0x62, 0x65, 0x64, 0x64, 0x69, 0x6e, 0x67,
 	0x52, 0x65, 0x73, 0x70, 0x6f, 0x6e, 0x73, 0x65, 0x12, 0x1c, 0x0a, 0x09, 0x65, 0x6d, 0x62, 0x65,
-	0x64, 0x64, 0x69, 0x6e, 0x67, 0x18, 0x01, 0x20, 0x03, 0x28, 0x02, 0x52, 0x09, 0x65, 0x6d, 0x62,
+	0x64, 0x64, 0x69, 0x6e, 0x67, 0x18, 0x01, 0x20, 0x01, 0x28, 0x0c, 0x52, 0x09, 0x65, 0x6d, 0x62,
 	0x65, 0x64, 0x64, 0x69, 0x6e, 0x67, 0x22, 0x4a, 0x0a, 0x0f, 0x41, 0x64, 0x64, 0x4d, 0x6f, 0x76,
 	0x69, 0x65, 0x52, 0x65, 0x71, 0x75, 0x65, 0x73, 0x74, 0x12, 0x19, 0x0a, 0x08, 0x6d, 0x6f, 0x76,
 	0x69, 0x65, 0x5f, 0x69, 0x64, 0x18, 0x01, 0x20, 0x01, 0x28, 0x05, 0x52, 0x07, 0x6d, 0x6f, 0x76,
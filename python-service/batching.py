@@ -0,0 +1,73 @@
+from concurrent import futures
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class BatchScheduler:
+    """Coalesces concurrent requests into a single batched call.
+
+    `submit(item)` enqueues the item and returns a future that is resolved once
+    a background worker has run `process_batch` over a batch containing it.
+    `process_batch` takes a list of items and returns one result per item.
+    """
+
+    def __init__(self, process_batch, max_batch, max_wait_ms):
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.requests = queue.Queue()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, item):
+        future = futures.Future()
+        self.requests.put((item, future))
+        return future
+
+    @staticmethod
+    def _accept(batch, request):
+        # Marks the future as running so it can no longer be cancelled, and
+        # drops requests that were cancelled while queued (e.g. an expired
+        # RPC deadline).
+        _, future = request
+        if future.set_running_or_notify_cancel():
+            batch.append(request)
+
+    def _next_batch(self):
+        # Block for the first live request, then collect more until the batch
+        # is full or the wait window closes.
+        batch = []
+        while not batch:
+            self._accept(batch, self.requests.get())
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            self._accept(batch, request)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                results = self.process_batch([item for item, _ in batch])
+            except Exception as e:
+                results = None
+                error = e
+
+            for i, (_, future) in enumerate(batch):
+                try:
+                    if results is None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(results[i])
+                except Exception:
+                    logger.exception("Failed to deliver a batch result")
@@ -1,111 +1,520 @@
+import asyncio
+from collections import OrderedDict
 from concurrent import futures
+import logging
+import os
+import signal
+import threading
+import time
+
+# Must be set before torch and faiss start their OpenMP runtimes.
+os.environ.setdefault('OMP_NUM_THREADS', str(os.cpu_count()))
+
 import grpc
 from proto import movie_pb2, movie_pb2_grpc
 from sentence_transformers import SentenceTransformer
+import torch
+import torch.nn.functional as F
+from transformers import AutoModel, AutoTokenizer
 import numpy as np
 import faiss
+from numba import njit
+from batching import BatchScheduler
+from locks import ReadWriteLock
+
+# Per-RPC messages are logged at DEBUG; run with LOG_LEVEL=WARNING in production.
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'))
+logger = logging.getLogger(__name__)
 
-# Embedding model and Faiss setup
+# Embedding model and Faiss setup.
+# Embeddings are L2-normalized before indexing, so inner product search
+# ranks by cosine similarity. HNSW gives sub-linear approximate search.
+# HNSW_M is the graph degree; a smaller efSearch trades recall for lower
+# search latency.
+# With USE_GPU_FAISS=1 and a GPU available, a flat index on the GPU is used
+# instead (Faiss has no GPU HNSW), and concurrent searches are batched.
 EMBEDDING_DIM = 384
-index = faiss.IndexFlatL2(EMBEDDING_DIM)
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 64
+HNSW_EF_SEARCH = 32
+USE_GPU_FAISS = os.environ.get('USE_GPU_FAISS', '0') == '1'
+
+gpu_resources = None
+if USE_GPU_FAISS and faiss.get_num_gpus() > 0:
+    gpu_resources = faiss.StandardGpuResources()
+    index = faiss.index_cpu_to_gpu(gpu_resources, 0, faiss.IndexFlatIP(EMBEDDING_DIM))
+else:
+    index = faiss.IndexHNSWFlat(EMBEDDING_DIM, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    index.hnsw.efSearch = HNSW_EF_SEARCH
 
 # Data storage
 movie_id_to_index = {}   # Maps movie_id to Faiss index position.
+index_to_movie_id = np.empty(1024, dtype=np.int64)  # Maps Faiss index position to movie_id.
 movie_id_to_title = {}   # Maps movie_id to title.
-embeddings_list = []     # Stores embeddings in order.
+embeddings = np.empty((1024, EMBEDDING_DIM), dtype=np.float32)  # Embedding rows in index order, grown as needed.
 next_index = 0           # Tracks the next index position.
 
-# Load sentence transformer model
-model = SentenceTransformer('all-MiniLM-L6-v2')
+# Embeddings are buffered and added to the index in batches by a background
+# thread, instead of one index.add call per RPC.
+FLUSH_INTERVAL_MS = 50
+pending_vecs = []        # Embeddings waiting to be added to the index.
+pending_movies = []      # (movie_id, title) for each pending embedding.
+pending_ids = set()      # movie_ids with a pending embedding.
+index_cond = threading.Condition()  # Guards the pending buffers and movie lookup dicts.
+# Searches share the index; flushes take it exclusively, since Faiss does
+# not allow add to run concurrently with search. Lock order: index_lock
+# before index_cond.
+index_lock = ReadWriteLock()
+INDEX_WAIT_TIMEOUT_S = 5  # Max time a search waits for its movie to be indexed.
 
-class EmbeddingService(movie_pb2_grpc.EmbeddingServiceServicer):
-    def GetMovieEmbedding(self, request, context):
-        global next_index
+def flush_pending():
+    """Adds pending embeddings to the index. Returns True when a save is due."""
+    global next_index, embeddings, index_to_movie_id, unsaved_count
+    with index_cond:
+        if not pending_vecs:
+            return False
+        batch_vecs = list(pending_vecs)
+        batch_movies = list(pending_movies)
+        pending_vecs.clear()
+        pending_movies.clear()
+        # pending_ids keeps these movies until they are searchable, so
+        # searches keep waiting and retries are still deduplicated.
+
+    with index_lock.write():
+        # Copy the batch straight into its storage rows and index that view,
+        # rather than allocating a staging array on every flush
+        count = len(batch_vecs)
+        while next_index + count > embeddings.shape[0]:
+            embeddings = np.resize(embeddings, (embeddings.shape[0] * 2, EMBEDDING_DIM))
+            index_to_movie_id = np.resize(index_to_movie_id, embeddings.shape[0])
+        for offset, embedding in enumerate(batch_vecs):
+            embeddings[next_index + offset] = embedding
+        vecs = embeddings[next_index:next_index + count]
+        faiss.normalize_L2(vecs)
+        index.add(vecs)
+
+        # Store information, offset from the pre-flush base position
+        with index_cond:
+            for offset, (movie_id, title) in enumerate(batch_movies):
+                movie_id_to_index[movie_id] = next_index + offset
+                movie_id_to_title[movie_id] = title
+                index_to_movie_id[next_index + offset] = movie_id
+                pending_ids.discard(movie_id)
+            next_index += count
+            index_cond.notify_all()
+
+            logger.debug("Added %d movies at index %d. Total: %d", count, next_index - count, index.ntotal)
+
+            # Saves rewrite the whole catalog, so space them out geometrically to
+            # keep the total bulk-load I/O linear in the catalog size.
+            unsaved_count += count
+            return unsaved_count >= max(SAVE_EVERY, int(next_index * SAVE_FRACTION))
+
+def flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL_MS / 1000.0)
+        if flush_pending():
+            # A failed save only loses persistence; the flush thread must
+            # keep running or every search waiting on a pending movie hangs.
+            try:
+                save_state()
+            except Exception:
+                logger.exception("Failed to save index to %s", STATE_PATH)
+
+# Persistence. The index, embedding rows, ids and titles are saved together
+# as one file in INDEX_DIR, and restored on startup, so a restart doesn't
+# need to re-encode the whole catalog. A save happens once SAVE_EVERY movies
+# or SAVE_FRACTION of the catalog (whichever is larger) are unsaved, and
+# on shutdown.
+INDEX_DIR = os.environ.get('INDEX_DIR', 'index_data')
+STATE_PATH = os.path.join(INDEX_DIR, 'index.npz')
+SAVE_EVERY = 1000
+SAVE_FRACTION = 0.1
+unsaved_count = 0        # Movies indexed since the last save snapshot.
+save_lock = threading.Lock()  # Serializes writers of STATE_PATH.
+
+def save_state():
+    """Snapshots the index and lookup tables under the index locks, then writes them outside them."""
+    global unsaved_count
+    with save_lock:
+        # A read lock is enough to keep flushes out while the snapshot is
+        # taken; searches carry on.
+        with index_lock.read(), index_cond:
+            saved_count = unsaved_count
+            if not saved_count:
+                return
+            cpu_index = faiss.index_gpu_to_cpu(index) if gpu_resources is not None else index
+            ids = index_to_movie_id[:next_index].copy()
+            state = {
+                'index': faiss.serialize_index(cpu_index),
+                'embeddings': embeddings[:next_index].copy(),
+                'ids': ids,
+            }
+            titles = [movie_id_to_title[movie_id] for movie_id in ids.tolist()]
+
+        # Titles are stored as one UTF-8 blob plus offsets rather than a
+        # fixed-width string array sized to the longest title.
+        encoded_titles = [title.encode('utf-8') for title in titles]
+        state['title_offsets'] = np.cumsum([0] + [len(title) for title in encoded_titles], dtype=np.int64)
+        state['titles'] = np.frombuffer(b''.join(encoded_titles), dtype=np.uint8)
+
+        # Write a temp file and rename it over the old one, so a kill
+        # mid-save never leaves a partial or inconsistent state behind.
+        os.makedirs(INDEX_DIR, exist_ok=True)
+        tmp_path = STATE_PATH + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **state)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, STATE_PATH)
+
+        # Only count the snapshot as saved once it is on disk; movies added
+        # since the snapshot stay unsaved.
+        with index_cond:
+            unsaved_count -= saved_count
+        logger.info("Saved %d movies to %s", len(ids), STATE_PATH)
+
+def load_state():
+    global index, embeddings, index_to_movie_id, next_index
+    if not os.path.exists(STATE_PATH):
+        return
+    with np.load(STATE_PATH) as state:
+        cpu_index = faiss.deserialize_index(state['index'])
+        stored_embeddings = state['embeddings']
+        stored_ids = state['ids']
+        title_blob = state['titles'].tobytes()
+        title_offsets = state['title_offsets'].tolist()
+    titles = [title_blob[start:end].decode('utf-8') for start, end in zip(title_offsets, title_offsets[1:])]
+    index = faiss.index_cpu_to_gpu(gpu_resources, 0, cpu_index) if gpu_resources is not None else cpu_index
+    next_index = index.ntotal
+
+    capacity = max(embeddings.shape[0], next_index)
+    embeddings = np.empty((capacity, EMBEDDING_DIM), dtype=np.float32)
+    embeddings[:next_index] = stored_embeddings
+    index_to_movie_id = np.empty(capacity, dtype=np.int64)
+    index_to_movie_id[:next_index] = stored_ids
+    movie_ids = stored_ids.tolist()
+    movie_id_to_index.update((movie_id, i) for i, movie_id in enumerate(movie_ids))
+    movie_id_to_title.update(zip(movie_ids, titles))
+    logger.info("Loaded %d movies from %s", next_index, STATE_PATH)
+
+def save_on_shutdown():
+    flush_pending()
+    save_state()
+
+load_state()
+threading.Thread(target=flush_loop, daemon=True).start()
+
+def queue_embedding(movie_id, title, embedding):
+    # Queue the embedding for the next batched index.add, unless the
+    # movie is already indexed (e.g. a client retry)
+    with index_cond:
+        if movie_id not in movie_id_to_index and movie_id not in pending_ids:
+            pending_vecs.append(embedding)
+            pending_movies.append((movie_id, title))
+            pending_ids.add(movie_id)
+
+def get_indexed_embedding(movie_id):
+    """Returns (index position, (1, dim) embedding row) of movie_id, or None.
+
+    Raises TimeoutError if the movie is still pending after INDEX_WAIT_TIMEOUT_S.
+    """
+    with index_cond:
+        # Wait until a pending embedding for this movie has been indexed
+        if not index_cond.wait_for(lambda: movie_id not in pending_ids, timeout=INDEX_WAIT_TIMEOUT_S):
+            raise TimeoutError(f"movie {movie_id} is still being indexed")
+        if movie_id not in movie_id_to_index:
+            return None
+        query_index = movie_id_to_index[movie_id]
+        return query_index, embeddings[query_index:query_index + 1]
+
+@njit
+def pick_neighbors(indices_row, k, self_idx, id_arr):
+    # Maps Faiss result positions to movie ids, skipping the query itself and
+    # the -1 padding Faiss returns when it finds fewer results than asked.
+    ids = np.empty(k, dtype=np.int64)
+    count = 0
+    for idx in indices_row:
+        if count == k:
+            break
+        if idx < 0 or idx == self_idx:
+            continue
+        ids[count] = id_arr[idx]
+        count += 1
+    return ids[:count]
+
+# Compile pick_neighbors now with the argument types the search path uses
+# (int64 Faiss labels and ids), so the first search RPC doesn't pay for it.
+pick_neighbors(np.zeros(1, dtype=np.int64), 1, 0, np.zeros(1, dtype=np.int64))
+
+# Load sentence transformer model. The ONNX Runtime backend runs the same
+# MiniLM weights through fused transformer kernels; set MODEL_BACKEND=torch
+# to fall back to PyTorch eager. With QUANTIZE=1 (off by default) the linear
+# layers run as dynamic int8 GEMMs on CPU; on CUDA the torch backend runs
+# in FP16 instead. MODEL_BACKEND=compiled runs the bare encoder through
+# torch.compile with the pooling inlined.
+MODEL_NAME = 'all-MiniLM-L6-v2'
+HF_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+MAX_SEQ_LENGTH = 256     # Same truncation as the sentence-transformers config.
+PAD_TO_MULTIPLE = 32     # Bucket padded lengths so the compiled encoder sees few shapes.
+TORCH_NUM_THREADS = int(os.environ.get('TORCH_NUM_THREADS', os.cpu_count()))
+MODEL_BACKEND = os.environ.get('MODEL_BACKEND', 'onnx')
+QUANTIZE = os.environ.get('QUANTIZE', '0') == '1'
+# The AVX2 build runs on any recent x86-64 CPU; model_qint8_avx512_vnni.onnx
+# is faster on CPUs with VNNI.
+ONNX_INT8_FILE = os.environ.get('ONNX_INT8_FILE', 'onnx/model_quint8_avx2.onnx')
+
+class HalfPrecisionSentenceTransformer(SentenceTransformer):
+    """SentenceTransformer that runs its forward pass in FP16 on CUDA.
+
+    Embeddings are cast back to float32 on return, which is what Faiss expects.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.half()
+
+    def encode(self, *args, **kwargs):
+        with torch.no_grad(), torch.autocast('cuda', dtype=torch.float16):
+            embeddings = super().encode(*args, **kwargs)
+        if isinstance(embeddings, np.ndarray):
+            embeddings = embeddings.astype(np.float32)
+        return embeddings
+
+class CompiledMiniLM:
+    """MiniLM encoder -> mean pooling -> L2 normalize, compiled with torch.compile.
+
+    Mirrors the subset of SentenceTransformer.encode used by the batch scheduler.
+    """
+
+    def __init__(self, model_name, device):
+        self.device = device
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        bert = AutoModel.from_pretrained(model_name).to(device).eval()
+        # Padded lengths vary per batch, so compile for dynamic shapes.
+        self.bert = torch.compile(bert, mode='reduce-overhead', dynamic=True)
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False):
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            # Round padded lengths up to a bucket, so CUDA graphs are recorded
+            # per bucket rather than per distinct sequence length.
+            encoded = self.tokenizer(texts[start:start + batch_size], padding=True, truncation=True,
+                                     max_length=MAX_SEQ_LENGTH, pad_to_multiple_of=PAD_TO_MULTIPLE,
+                                     return_tensors='pt').to(self.device)
+            token_embeddings = self.bert(**encoded).last_hidden_state
+            mask = encoded['attention_mask'].unsqueeze(-1).to(token_embeddings.dtype)
+            pooled = (token_embeddings * mask).sum(1) / mask.sum(1).clamp(min=1e-9)
+            chunks.append(F.normalize(pooled, p=2, dim=1))
+        embeddings = torch.cat(chunks)
+        if convert_to_numpy:
+            return embeddings.float().cpu().numpy()
+        return embeddings
+
+def load_model():
+    if MODEL_BACKEND == 'compiled':
+        model = CompiledMiniLM(HF_MODEL_NAME, 'cuda' if torch.cuda.is_available() else 'cpu')
+        # torch.compile runs on the first call; do it now instead of
+        # stalling the first batch of GetMovieEmbedding RPCs behind it.
+        with torch.inference_mode():
+            model.encode(['warmup'])
+        return model
+
+    if MODEL_BACKEND == 'onnx':
+        model_kwargs = {'provider': 'CPUExecutionProvider'}
+        if QUANTIZE:
+            # Dynamically quantized export published alongside the model.
+            model_kwargs['file_name'] = ONNX_INT8_FILE
+        return SentenceTransformer(MODEL_NAME, backend='onnx', model_kwargs=model_kwargs)
 
+    if torch.cuda.is_available():
+        return HalfPrecisionSentenceTransformer(MODEL_NAME, device='cuda')
+
+    model = SentenceTransformer(MODEL_NAME, device='cpu')
+    if QUANTIZE:
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+# All encoding runs on the single batch scheduler thread, so give it every
+# core and no inter-op pool, instead of several concurrent forward passes
+# each spawning a full set of OpenMP threads.
+torch.set_num_threads(TORCH_NUM_THREADS)
+torch.set_num_interop_threads(1)
+
+model = load_model()
+
+# Micro-batching settings
+MAX_BATCH = 32           # Max number of texts encoded in one forward pass.
+MAX_WAIT_MS = 10         # Max time to wait for an encode batch to fill up.
+SEARCH_MAX_WAIT_MS = 5   # Max time to wait for a GPU search batch to fill up.
+EMBEDDING_CACHE_SIZE = 100_000  # Max number of texts whose embeddings are cached.
+MAX_SIMILAR_LIMIT = 100  # Max GetSimilarMovies limit; keeps batched GPU searches under Faiss' k cap.
+
+def encode_batch(texts):
+    # encode() sorts texts by length internally, so each sub-batch is only
+    # padded to its own longest text. inference_mode skips autograd
+    # bookkeeping entirely.
+    with torch.inference_mode():
+        return model.encode(texts, batch_size=MAX_BATCH,
+                            convert_to_numpy=True, show_progress_bar=False)
+
+def search_batch(queries):
+    # One index.search over all queries, using the largest requested k.
+    k = max(num_neighbors for _, num_neighbors in queries)
+    with index_lock.read():
+        distances, indices = index.search(np.concatenate([query for query, _ in queries]), k)
+    return [(distances[i:i + 1, :num_neighbors], indices[i:i + 1, :num_neighbors])
+            for i, (_, num_neighbors) in enumerate(queries)]
+
+def search_index(query_embedding, num_neighbors):
+    with index_lock.read():
+        return index.search(query_embedding, num_neighbors)
+
+async def similar_movie_ids(movie_id, limit):
+    """Returns up to `limit` movie ids most similar to movie_id, or None if it is not indexed."""
+    loop = asyncio.get_running_loop()
+    indexed = await loop.run_in_executor(index_pool, get_indexed_embedding, movie_id)
+    if indexed is None:
+        return None
+    query_index, query_embedding = indexed
+
+    # Search for `limit + 1` nearest neighbors, since the 1st is itself.
+    # Stored rows are already unit-norm, so the query needs no normalizing.
+    # GPU searches are awaited here rather than on index_pool, so a batch
+    # isn't capped by the pool size.
+    if search_scheduler is not None:
+        distances, indices = await asyncio.wrap_future(search_scheduler.submit((query_embedding, limit + 1)))
+    else:
+        distances, indices = await loop.run_in_executor(index_pool, search_index, query_embedding, limit + 1)
+
+    # index_to_movie_id only grows, so it covers every position the search returned.
+    return pick_neighbors(indices[0], limit, query_index, index_to_movie_id)
+
+encode_scheduler = BatchScheduler(encode_batch, MAX_BATCH, MAX_WAIT_MS)
+
+# Calls that take index_cond or index_lock run here, so they never block the event loop.
+INDEX_POOL_WORKERS = 4
+index_pool = futures.ThreadPoolExecutor(max_workers=INDEX_POOL_WORKERS)
+
+# Movie metadata lookups run here. Titles are in memory today, but a
+# metadata store would do blocking I/O.
+IO_POOL_WORKERS = 4
+io_pool = futures.ThreadPoolExecutor(max_workers=IO_POOL_WORKERS)
+
+def fetch_titles(movie_ids):
+    """Returns {movie_id: title} for the given movie ids."""
+    return {movie_id: movie_id_to_title.get(movie_id, "Unknown") for movie_id in movie_ids}
+
+# Embeddings cached as little-endian float32 bytes, so cached vectors are
+# immutable. Only touched from the event loop, so no lock is needed.
+embedding_cache = OrderedDict()
+
+async def encode_cached(text):
+    buf = embedding_cache.get(text)
+    if buf is not None:
+        embedding_cache.move_to_end(text)
+        return buf
+
+    embedding = await asyncio.wrap_future(encode_scheduler.submit(text))
+    buf = embedding.astype('<f4').tobytes()
+    embedding_cache[text] = buf
+    if len(embedding_cache) > EMBEDDING_CACHE_SIZE:
+        embedding_cache.popitem(last=False)
+    return buf
+
+# Single-query GPU search is slower than CPU, so only batch it on the GPU.
+search_scheduler = None
+if gpu_resources is not None:
+    search_scheduler = BatchScheduler(search_batch, MAX_BATCH, SEARCH_MAX_WAIT_MS)
+
+class EmbeddingService(movie_pb2_grpc.EmbeddingServiceServicer):
+    async def GetMovieEmbedding(self, request, context):
         # Generate the embedding from the title and overview
         text = f"{request.title}: {request.overview}"
-        embedding = model.encode(text, convert_to_numpy=True)
+        buf = await encode_cached(text)
+        embedding = np.frombuffer(buf, dtype='<f4')
 
-        # Add the embedding to the Faiss index
-        embedding_np = np.array([embedding], dtype=np.float32)
-        index.add(embedding_np)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(index_pool, queue_embedding, request.movie_id, request.title, embedding)
 
-        # Store information
-        movie_id = request.movie_id
-        movie_id_to_index[movie_id] = next_index
-        movie_id_to_title[movie_id] = request.title  # Store movie title
-        embeddings_list.append(embedding)
-        next_index += 1
+        # The cached bytes are already the little-endian float32 wire format
+        return movie_pb2.EmbeddingResponse(embedding=buf)
 
-        print(f"Added movie {movie_id} ({request.title}) at index {next_index - 1}. Total: {index.ntotal}")
-        return movie_pb2.EmbeddingResponse(embedding=embedding.tolist())
-
-    def GetSimilarMovie(self, request, context):
+    async def GetSimilarMovie(self, request, context):
         query_movie_id = request.movie_id
-        if query_movie_id not in movie_id_to_index:
+        try:
+            similar_ids = await similar_movie_ids(query_movie_id, 1)
+        except TimeoutError:
+            context.set_details("Timed out waiting for the movie to be indexed")
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            return movie_pb2.SimilarMovieResponse()
+        if similar_ids is None:
             context.set_details("Movie ID not found in index")
             context.set_code(grpc.StatusCode.NOT_FOUND)
             return movie_pb2.SimilarMovieResponse()
 
-        query_index = movie_id_to_index[query_movie_id]
-        query_embedding = np.array([embeddings_list[query_index]], dtype=np.float32)
-
-        # Search for 2 nearest neighbors (1st is itself)
-        distances, indices = index.search(query_embedding, 2)
-        if indices.shape[1] < 2:
+        if len(similar_ids) == 0:
             context.set_details("Not enough neighbors found")
             context.set_code(grpc.StatusCode.NOT_FOUND)
             return movie_pb2.SimilarMovieResponse()
 
-        # Second result is the most similar movie
-        similar_index = int(indices[0][1])
-        similar_movie_id = next((mid for mid, idx in movie_id_to_index.items() if idx == similar_index), None)
-
-        if similar_movie_id is None:
-            context.set_details("Similar movie not found")
-            context.set_code(grpc.StatusCode.NOT_FOUND)
-            return movie_pb2.SimilarMovieResponse()
-
+        similar_movie_id = int(similar_ids[0])
         similar_title = movie_id_to_title.get(similar_movie_id, "")
-        print(f"Most similar movie to {query_movie_id}: {similar_movie_id} - {similar_title}")
+        logger.debug("Most similar movie to %d: %d - %s", query_movie_id, similar_movie_id, similar_title)
 
         return movie_pb2.SimilarMovieResponse(movie_id=similar_movie_id, title=similar_title)
 
-    def GetSimilarMovies(self, request, context):
+    async def GetSimilarMovies(self, request, context):
+        # Reject bad limits up front, since one query's k is shared by every
+        # search batched with it.
+        if not 0 < request.limit <= MAX_SIMILAR_LIMIT:
+            context.set_details(f"limit must be between 1 and {MAX_SIMILAR_LIMIT}")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            return movie_pb2.SimilarMoviesResponse()
+
         query_movie_id = request.movie_id
-        if query_movie_id not in movie_id_to_index:
+        try:
+            similar_ids = await similar_movie_ids(query_movie_id, request.limit)
+        except TimeoutError:
+            context.set_details("Timed out waiting for the movie to be indexed")
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            return movie_pb2.SimilarMoviesResponse()
+        if similar_ids is None:
             context.set_details("Movie ID not found in index")
             context.set_code(grpc.StatusCode.NOT_FOUND)
             return movie_pb2.SimilarMoviesResponse()
 
-        query_index = movie_id_to_index[query_movie_id]
-        query_embedding = np.array([embeddings_list[query_index]], dtype=np.float32)
+        # Fetch neighbor metadata off the event loop as soon as the ids are known
+        similar_ids = similar_ids.tolist()
+        loop = asyncio.get_running_loop()
+        titles = await loop.run_in_executor(io_pool, fetch_titles, similar_ids)
 
-        # Search for `limit + 1` nearest neighbors (excluding itself)
-        num_neighbors = request.limit + 1
-        distances, indices = index.search(query_embedding, num_neighbors)
+        similar_movies = [
+            movie_pb2.SimilarMovieResponse(movie_id=similar_movie_id, title=titles[similar_movie_id])
+            for similar_movie_id in similar_ids
+        ]
 
-        similar_movies = []
-        for i in range(1, min(num_neighbors, indices.shape[1])):  # Start from 1 to skip itself
-            similar_index = int(indices[0][i])
-            similar_movie_id = next((mid for mid, idx in movie_id_to_index.items() if idx == similar_index), None)
-
-            if similar_movie_id is not None:
-                similar_movies.append(movie_pb2.SimilarMovieResponse(
-                    movie_id=similar_movie_id,
-                    title=movie_id_to_title.get(similar_movie_id, "Unknown")
-                ))
-
-        print(f"Top {len(similar_movies)} similar movies to {query_movie_id}: {[m.movie_id for m in similar_movies]}")
+        logger.debug("Top %d similar movies to %d: %s", len(similar_movies), query_movie_id, similar_ids)
         return movie_pb2.SimilarMoviesResponse(recommendations=similar_movies)
 
-def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+SHUTDOWN_GRACE_S = 5     # Time in-flight RPCs get to finish on SIGTERM.
+
+async def serve():
+    server = grpc.aio.server()
     movie_pb2_grpc.add_EmbeddingServiceServicer_to_server(EmbeddingService(), server)
     server.add_insecure_port('[::]:50051')
-    server.start()
-    print("Server started on port 50051.")
-    server.wait_for_termination()
+    await server.start()
+    logger.info("Server started on port 50051.")
+
+    # asyncio.run only handles SIGINT; stop cleanly on SIGTERM too, so the
+    # final save below runs under docker stop / kill.
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.ensure_future(server.stop(SHUTDOWN_GRACE_S)))
+    try:
+        await server.wait_for_termination()
+    finally:
+        save_on_shutdown()
 
 if __name__ == '__main__':
-    serve()
+    asyncio.run(serve())
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from batching import BatchScheduler
+
+def wait_until(predicate, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.001)
+
+class BatchSchedulerTest(unittest.TestCase):
+    def test_batches_concurrent_requests(self):
+        batches = []
+        def process(items):
+            batches.append(list(items))
+            return [item * 2 for item in items]
+
+        scheduler = BatchScheduler(process, max_batch=4, max_wait_ms=50)
+        pending = [scheduler.submit(i) for i in range(3)]
+
+        self.assertEqual([f.result(timeout=1) for f in pending], [0, 2, 4])
+        self.assertEqual(batches, [[0, 1, 2]])
+
+    def test_cancelled_request_does_not_stop_worker(self):
+        release = threading.Event()
+        def process(items):
+            release.wait()
+            return [item * 2 for item in items]
+
+        scheduler = BatchScheduler(process, max_batch=1, max_wait_ms=1)
+        in_flight = scheduler.submit(1)
+        wait_until(in_flight.running)
+        queued = scheduler.submit(2)
+
+        # A queued request can be cancelled; one already being processed can't.
+        self.assertTrue(queued.cancel())
+        self.assertFalse(in_flight.cancel())
+
+        release.set()
+        self.assertEqual(in_flight.result(timeout=1), 2)
+        self.assertEqual(scheduler.submit(3).result(timeout=1), 6)
+        self.assertTrue(scheduler.worker.is_alive())
+
+    def test_timed_out_await_does_not_stop_worker(self):
+        release = threading.Event()
+        def process(items):
+            release.wait()
+            return [item * 2 for item in items]
+
+        scheduler = BatchScheduler(process, max_batch=1, max_wait_ms=1)
+
+        async def run():
+            blocker = scheduler.submit(0)
+            wait_until(blocker.running)
+            # Cancels the wrapped future while it is still queued, as an
+            # expired RPC deadline does.
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(asyncio.wrap_future(scheduler.submit(1)), timeout=0.01)
+            release.set()
+            return await asyncio.wait_for(asyncio.wrap_future(scheduler.submit(2)), timeout=1)
+
+        self.assertEqual(asyncio.run(run()), 4)
+        self.assertTrue(scheduler.worker.is_alive())
+
+    def test_process_error_is_delivered_to_every_request(self):
+        def process(items):
+            raise ValueError("boom")
+
+        scheduler = BatchScheduler(process, max_batch=4, max_wait_ms=20)
+        pending = [scheduler.submit(i) for i in range(2)]
+
+        for future in pending:
+            with self.assertRaises(ValueError):
+                future.result(timeout=1)
+        self.assertTrue(scheduler.worker.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
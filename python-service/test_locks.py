@@ -0,0 +1,80 @@
+import threading
+import time
+import unittest
+
+from locks import ReadWriteLock
+
+class ReadWriteLockTest(unittest.TestCase):
+    def test_readers_share_the_lock(self):
+        lock = ReadWriteLock()
+        both_inside = threading.Barrier(2, timeout=1)
+
+        def read():
+            with lock.read():
+                both_inside.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=2)
+        self.assertFalse(both_inside.broken)
+
+    def test_writer_excludes_readers(self):
+        lock = ReadWriteLock()
+        events = []
+        writer_inside = threading.Event()
+
+        def write():
+            with lock.write():
+                writer_inside.set()
+                time.sleep(0.05)
+                events.append('write done')
+
+        def read():
+            writer_inside.wait()
+            with lock.read():
+                events.append('read')
+
+        threads = [threading.Thread(target=write), threading.Thread(target=read)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=2)
+        self.assertEqual(events, ['write done', 'read'])
+
+    def test_waiting_writer_blocks_new_readers(self):
+        lock = ReadWriteLock()
+        events = []
+        release_reader = threading.Event()
+        first_reader_inside = threading.Event()
+
+        def first_reader():
+            with lock.read():
+                first_reader_inside.set()
+                release_reader.wait()
+
+        def write():
+            with lock.write():
+                events.append('write')
+
+        def second_reader():
+            with lock.read():
+                events.append('read')
+
+        reader = threading.Thread(target=first_reader)
+        reader.start()
+        first_reader_inside.wait()
+        writer = threading.Thread(target=write)
+        writer.start()
+        time.sleep(0.02)  # Let the writer start waiting.
+        late_reader = threading.Thread(target=second_reader)
+        late_reader.start()
+        time.sleep(0.02)
+        release_reader.set()
+        for t in (reader, writer, late_reader):
+            t.join(timeout=2)
+        self.assertEqual(events, ['write', 'read'])
+
+if __name__ == '__main__':
+    unittest.main()